@@ -1,16 +1,53 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from collections import OrderedDict
 from typing import List
+import asyncio
+import gc
+import hashlib
+import json
+import logging
 import os
+import queue
+import re
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+import numpy as np
+
+# Faster event loop for the I/O-heavy request path (Drive, Docs, Groq).
+# uvicorn picks uvloop up automatically when installed; setting the
+# policy here covers embedders and test runners that import the app.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 from app.config import get_settings
 from app.models import ChatRequest, ChatResponse, IndexRequest, IndexResponse, DocumentInfo
 from app.services.google_drive import GoogleDriveService
 from app.services.chunker import TextChunker
+from app.services.embedding_cache import EmbeddingCache
 from app.services.embeddings import EmbeddingEngine
 from app.services.vector_store import VectorStore
+from app.services.batcher import SearchBatcher
 from app.services.llm import LLMService
+from app.services.query_cache import SemanticQueryCache
+
+# Non-blocking logging: records are enqueued here and a background
+# listener thread does the actual stdout writes, so the event loop never
+# waits on terminal I/O
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+
+logger = logging.getLogger("app")
+logger.addHandler(QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -34,6 +71,19 @@ async def startup_event():
     print("   • Press CTRL+C to stop the server")
     print("\n" + "="*70 + "\n")
 
+    _log_listener.start()
+
+    # Warm the vector store so the first /chat doesn't pay the disk load
+    await search_batcher.run(
+        vector_store.reload_if_changed, settings.vector_store_path, "all_docs"
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued log records"""
+    _log_listener.stop()
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -46,14 +96,183 @@ app.add_middleware(
 # Get settings
 settings = get_settings()
 
+# Create data directories
+os.makedirs(settings.vector_store_path, exist_ok=True)
+os.makedirs(settings.embed_cache_dir, exist_ok=True)
+
 # Initialize services
 drive_service = GoogleDriveService(settings.google_application_credentials)
 chunker = TextChunker(chunk_size=settings.chunk_size, chunk_overlap=settings.chunk_overlap)
-embedding_engine = EmbeddingEngine()
+embedding_engine = EmbeddingEngine(
+    cache=EmbeddingCache(os.path.join(settings.embed_cache_dir, "chunk_vectors.db"))
+)
 llm_service = LLMService(settings.groq_api_key)
 
-# Create data directory
-os.makedirs(settings.vector_store_path, exist_ok=True)
+# Long-lived vector store: loaded once at startup and re-read only when
+# the on-disk index changes (indexing endpoints bump its mtime)
+vector_store = VectorStore(dimension=embedding_engine.dimension, nprobe=settings.nprobe,
+                          index_kind=settings.index_kind, sq_type=settings.sq_type)
+
+# Groups concurrent /chat searches into single batched FAISS calls
+search_batcher = SearchBatcher(vector_store)
+
+# Serializes the mutating endpoints against each other. The index
+# mutations themselves run on the batcher's single search thread (via
+# search_batcher.run), which also serializes them with in-flight
+# searches - FAISS add/reload concurrent with search is not safe.
+_store_lock = asyncio.Lock()
+
+
+async def _ensure_store_current() -> bool:
+    """Reload the shared store if its files changed; True if index exists"""
+    async with _store_lock:
+        return await search_batcher.run(
+            vector_store.reload_if_changed, settings.vector_store_path, "all_docs"
+        )
+
+# Process-local LRU of search results keyed on (query, k, generation).
+# Indexing endpoints bump the generation so stale hits can't be served.
+_search_cache = OrderedDict()
+_SEARCH_CACHE_MAX = 512
+_index_generation = 0
+
+# Paraphrase-tolerant response cache for first-turn questions
+semantic_cache = SemanticQueryCache(dimension=embedding_engine.dimension)
+
+
+def _bump_index_generation():
+    """Invalidate cached search results after the index changes"""
+    global _index_generation
+    _index_generation += 1
+    semantic_cache.invalidate()
+
+
+# Error classification: each class is one compiled scan instead of a
+# chain of per-substring passes over the message; first match wins,
+# ordered most specific first
+_PERMISSION_RE = re.compile(r"403|permission denied", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(r"404|not found", re.IGNORECASE)
+
+_CHAT_ERROR_CLASSES = [
+    (re.compile(r"rate_limit|429|too many requests", re.IGNORECASE), 429, {
+        "error": "Rate Limit Exceeded",
+        "message": "Too many requests to the AI service. Please wait a moment.",
+        "retry_after": "30 seconds",
+        "steps": [
+            "1. Wait 30 seconds before trying again",
+            "2. Reduce the frequency of your requests",
+            "3. Consider upgrading your GROQ API plan for higher limits"
+        ]
+    }),
+    (re.compile(r"api|authentication|401", re.IGNORECASE), 503, {
+        "error": "AI Service Unavailable",
+        "message": "Cannot connect to AI service. Please check your API key.",
+        "steps": [
+            "1. Verify GROQ_API_KEY in your .env file",
+            "2. Ensure the API key is valid and active",
+            "3. Check if your GROQ account has credits",
+            "4. Try regenerating your API key at console.groq.com"
+        ]
+    }),
+    (re.compile(r"model|embedding", re.IGNORECASE), 503, {
+        "error": "Model Service Error",
+        "message": "Error generating embeddings or processing text.",
+        "steps": [
+            "1. The embedding service may be temporarily down",
+            "2. Try again in a few moments",
+            "3. Check your internet connection"
+        ]
+    }),
+]
+
+
+def _classify_chat_error(error_msg: str) -> HTTPException:
+    """Map a /chat failure message to the matching HTTP error"""
+    for pattern, status_code, detail in _CHAT_ERROR_CLASSES:
+        if pattern.search(error_msg):
+            return HTTPException(status_code=status_code, detail=detail)
+
+    return HTTPException(
+        status_code=500,
+        detail={
+            "error": "Chat Processing Error",
+            "message": error_msg,
+            "steps": [
+                "1. Try asking your question differently",
+                "2. If problem persists, check server logs",
+                "3. Verify all services are running properly"
+            ]
+        }
+    )
+
+
+def _manifest_path():
+    """Path of the {doc_id: modified} manifest for the saved index"""
+    return os.path.join(settings.vector_store_path, "all_docs_manifest.json")
+
+
+def _index_fingerprint():
+    """Parameters the saved index depends on beyond document contents
+
+    Changing any of these invalidates every chunk and embedding, so the
+    manifest fast path must not declare the index up to date across a
+    change - same key material the embedding cache path uses.
+    """
+    return f"{settings.chunk_size}|{settings.chunk_overlap}|{embedding_engine.model_name}"
+
+
+def _load_manifest():
+    """Load the manifest's {doc_id: modified} map
+
+    Returns {} when the manifest is absent, corrupt, in the legacy flat
+    format, or was written under different chunking/model parameters -
+    all of which mean the fast path must not match.
+    """
+    try:
+        with open(_manifest_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('fingerprint') != _index_fingerprint():
+        return {}
+    return data.get('docs', {})
+
+
+def _save_manifest(docs):
+    """Atomically persist the manifest with the current fingerprint"""
+    tmp_path = _manifest_path() + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': _index_fingerprint(), 'docs': docs},
+                  f, ensure_ascii=False)
+    os.replace(tmp_path, _manifest_path())
+
+
+def _embed_cache_path(doc):
+    """Cache file path for a document's chunks + embeddings"""
+    key = hashlib.sha256(
+        f"{doc['id']}|{doc['modified']}|{settings.chunk_size}|"
+        f"{settings.chunk_overlap}|{embedding_engine.model_name}".encode()
+    ).hexdigest()
+    return os.path.join(settings.embed_cache_dir, f"{key}.npz")
+
+
+def _load_embed_cache(cache_path):
+    """Load cached (chunks, embeddings) for a document, or None on miss"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        data = np.load(cache_path)
+        return data['chunks'].tolist(), data['embeddings']
+    except Exception:
+        # Corrupt or partial cache entry - treat as a miss
+        return None
+
+
+def _save_embed_cache(cache_path, chunks, embeddings):
+    """Atomically write a document's cache entry"""
+    tmp_path = cache_path + ".tmp.npz"
+    np.savez(tmp_path, chunks=np.array(chunks), embeddings=embeddings)
+    os.replace(tmp_path, cache_path)
 
 
 @app.get("/")
@@ -72,22 +291,23 @@ async def list_documents():
     List all documents in the configured Google Drive folder
     """
     try:
-        docs = drive_service.list_documents_in_folder(settings.google_drive_folder_id)
-        
-        # Check which ones are indexed
-        result = []
-        for doc in docs:
-            indexed = os.path.exists(
-                os.path.join(settings.vector_store_path, f"all_docs_index.faiss")
-            )
-            result.append(DocumentInfo(
+        docs = await drive_service.list_documents_in_folder_async(settings.google_drive_folder_id)
+
+        # Check which ones are indexed: one store lookup instead of a
+        # stat() per document, and per-doc status from the ids actually
+        # present in the index
+        has_index = await _ensure_store_current()
+        indexed_ids = vector_store.indexed_doc_ids() if has_index else set()
+
+        return [
+            DocumentInfo(
                 id=doc['id'],
                 name=doc['name'],
                 modified=doc['modified'],
-                indexed=indexed
-            ))
-        
-        return result
+                indexed=doc['id'] in indexed_ids
+            )
+            for doc in docs
+        ]
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing documents: {str(e)}")
@@ -106,12 +326,12 @@ async def index_all_documents():
     try:
         # Get all documents in folder
         try:
-            docs = drive_service.list_documents_in_folder(settings.google_drive_folder_id)
+            docs = await drive_service.list_documents_in_folder_async(settings.google_drive_folder_id)
         except Exception as e:
             error_msg = str(e)
             
             # Handle permission/access errors
-            if "403" in error_msg or "Permission denied" in error_msg:
+            if _PERMISSION_RE.search(error_msg):
                 raise HTTPException(
                     status_code=403,
                     detail={
@@ -128,7 +348,7 @@ async def index_all_documents():
                 )
             
             # Handle folder not found
-            elif "404" in error_msg or "not found" in error_msg.lower():
+            elif _NOT_FOUND_RE.search(error_msg):
                 raise HTTPException(
                     status_code=404,
                     detail={
@@ -159,116 +379,202 @@ async def index_all_documents():
                 }
             )
         
-        print(f"Found {len(docs)} documents in folder")
-        
-        # Initialize vector store
-        vector_store = VectorStore(dimension=embedding_engine.dimension)
+        logger.info("Found %d documents in folder", len(docs))
+
+        # Manifest fast path: if the listing exactly matches the snapshot
+        # the saved index was built from (same ids, same modified stamps),
+        # there is nothing to rebuild
+        listing_snapshot = {doc['id']: doc['modified'] for doc in docs}
+        if listing_snapshot == _load_manifest() and await _ensure_store_current():
+            logger.info("Index already up to date - %d documents unchanged", len(docs))
+            return IndexResponse(
+                message="Index already up to date - no documents changed",
+                chunks_indexed=0,
+                documents_processed=0,
+                total_documents=len(docs)
+            )
+
+        # Build a fresh store, swapped in for the shared one once saved
+        new_store = VectorStore(dimension=embedding_engine.dimension, nprobe=settings.nprobe,
+                                index_kind=settings.index_kind, sq_type=settings.sq_type)
         total_chunks = 0
         processed_docs = 0
         failed_docs = []
-        
-        # Process each document
-        for doc in docs:
+        indexed_manifest = {}  # doc_id -> modified, for docs that made it in
+
+        # Cap concurrent Drive API calls
+        semaphore = asyncio.Semaphore(settings.index_concurrency)
+
+        async def _process_document(doc):
+            """
+            Fetch and chunk a single document off the event loop.
+
+            Returns (chunks, embeddings, error) - error is None on success,
+            embeddings is non-None only on an embedding-cache hit, and
+            chunks is None on failure.
+            """
             try:
-                print(f"Processing: {doc['name']} ({doc['id']})")
-                
-                # Read document
+                # Unchanged documents (same id/modified/chunking/model) are
+                # served from the on-disk embedding cache - no Drive fetch,
+                # no chunking, no re-embedding
+                cache_path = _embed_cache_path(doc)
+                cached = await asyncio.to_thread(_load_embed_cache, cache_path)
+                if cached is not None:
+                    chunks, embeddings = cached
+                    logger.info("♻️  Embedding cache hit for %s (%d chunks)", doc['name'], len(chunks))
+                    return chunks, embeddings, None
+
+                logger.info("Processing: %s (%s)", doc['name'], doc['id'])
+
+                # Read document (non-blocking Docs API call)
                 try:
-                    text = drive_service.get_document_content(doc['id'])
+                    async with semaphore:
+                        text = await drive_service.get_document_content_async(doc['id'])
                 except Exception as e:
                     error_msg = str(e)
-                    
+
                     # Document is private/not shared
-                    if "403" in error_msg or "Permission denied" in error_msg:
-                        failed_docs.append({
-                            "name": doc['name'],
-                            "error": "Permission denied - document not shared with service account"
-                        })
-                        print(f"  ⚠️  Skipping {doc['name']}: Permission denied")
-                        continue
-                    
+                    if _PERMISSION_RE.search(error_msg):
+                        logger.warning("⚠️  Skipping %s: Permission denied", doc['name'])
+                        return None, None, "Permission denied - document not shared with service account"
+
                     # Document deleted or invalid
-                    elif "404" in error_msg:
-                        failed_docs.append({
-                            "name": doc['name'],
-                            "error": "Document not found or deleted"
-                        })
-                        print(f"  ⚠️  Skipping {doc['name']}: Not found")
-                        continue
-                    
+                    elif _NOT_FOUND_RE.search(error_msg):
+                        logger.warning("⚠️  Skipping %s: Not found", doc['name'])
+                        return None, None, "Document not found or deleted"
+
                     raise
-                
+
                 # Handle empty documents
                 if not text or len(text.strip()) == 0:
-                    failed_docs.append({
-                        "name": doc['name'],
-                        "error": "Document is empty"
-                    })
-                    print(f"  ⚠️  Skipping empty document: {doc['name']}")
-                    continue
-                
+                    logger.warning("⚠️  Skipping empty document: %s", doc['name'])
+                    return None, None, "Document is empty"
+
                 # Check minimum content length
                 if len(text.strip()) < 50:
-                    failed_docs.append({
-                        "name": doc['name'],
-                        "error": f"Document too short ({len(text)} characters, minimum 50 required)"
-                    })
-                    print(f"  ⚠️  Skipping {doc['name']}: Too short")
-                    continue
-                
-                # Chunk text
-                chunks = chunker.chunk_text(text)
-                
+                    logger.warning("⚠️  Skipping %s: Too short", doc['name'])
+                    return None, None, f"Document too short ({len(text)} characters, minimum 50 required)"
+
+                # Chunk text (CPU-bound -> thread pool)
+                chunks = await asyncio.to_thread(chunker.chunk_text, text)
+
                 if not chunks:
-                    failed_docs.append({
-                        "name": doc['name'],
-                        "error": "Could not create valid chunks from document"
-                    })
-                    print(f"  ⚠️  No chunks created for: {doc['name']}")
-                    continue
-                
-                print(f"  Created {len(chunks)} chunks")
-                
-                # Generate embeddings with retry logic
-                max_retries = 3
-                retry_delay = 2
-                
-                for attempt in range(max_retries):
-                    try:
-                        embeddings = embedding_engine.encode(chunks)
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            print(f"  Retry {attempt + 1}/{max_retries} for embeddings...")
-                            import time
-                            time.sleep(retry_delay)
-                        else:
-                            failed_docs.append({
-                                "name": doc['name'],
-                                "error": f"Failed to generate embeddings after {max_retries} attempts"
-                            })
-                            print(f"  ❌ Failed to generate embeddings for: {doc['name']}")
-                            continue
-                
-                # Add to vector store with metadata
-                metadata = {
-                    'doc_id': doc['id'],
-                    'doc_name': doc['name'],
-                    'modified': doc['modified']
-                }
-                vector_store.add_documents(chunks, embeddings, metadata)
-                
+                    logger.warning("⚠️  No chunks created for: %s", doc['name'])
+                    return None, None, "Could not create valid chunks from document"
+
+                logger.info("Created %d chunks", len(chunks))
+                return chunks, None, None
+
+            except Exception as e:
+                logger.error("❌ Error processing %s: %s", doc['name'], str(e))
+                return None, None, str(e)
+
+        # Fetch and chunk all documents concurrently. _process_document
+        # converts its own failures into (None, None, error) tuples, but
+        # return_exceptions keeps one unexpected escape (cancellation,
+        # MemoryError) from tearing down every other in-flight document.
+        results = await asyncio.gather(
+            *[_process_document(doc) for doc in docs], return_exceptions=True
+        )
+        results = [
+            (None, None, str(result)) if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+        # Reserve index capacity up front - chunk counts are known after
+        # the gather, so the FAISS buffer is sized once instead of
+        # reallocating as each wave streams in
+        new_store.reserve(sum(len(chunks) for chunks, _, _ in results if chunks))
+
+        def _add_to_store(doc, chunks, embeddings):
+            metadata = {
+                'doc_id': doc['id'],
+                'doc_name': doc['name'],
+                'modified': doc['modified']
+            }
+            new_store.add_documents(chunks, embeddings, metadata)
+            indexed_manifest[doc['id']] = doc['modified']
+            logger.info("✅ Added %d chunks to index for %s", len(chunks), doc['name'])
+
+        # Encode pending documents in bounded "waves" so peak memory stays
+        # flat regardless of folder size: each wave is batched across docs,
+        # encoded, streamed into the index and freed before the next one.
+        # Wave size is capped by the index_stream_chunks setting.
+        wave = []  # (doc, chunks) awaiting embedding
+        wave_chunks = 0
+
+        async def _flush_wave():
+            nonlocal total_chunks, processed_docs, wave_chunks
+            if not wave:
+                return
+
+            flat = []
+            slices = []  # (doc, start, end) into flat
+            for doc, chunks in wave:
+                start = len(flat)
+                flat.extend(chunks)
+                slices.append((doc, start, len(flat)))
+
+            # Generate embeddings for the wave with retry logic; the
+            # engine handles length-sorted ("smart") batching internally
+            max_retries = 3
+            retry_delay = 2
+
+            for attempt in range(max_retries):
+                try:
+                    embeddings = await asyncio.to_thread(
+                        embedding_engine.encode, flat, settings.embed_batch_size
+                    )
+                    break
+                except Exception:
+                    if attempt < max_retries - 1:
+                        logger.warning("Retry %d/%d for embeddings...", attempt + 1, max_retries)
+                        await asyncio.sleep(retry_delay)
+                    else:
+                        raise Exception(f"Failed to generate embeddings after {max_retries} attempts")
+
+            # Slice embeddings back per document, refresh the cache and add
+            # to the index serially to avoid FAISS contention
+            for doc, start, end in slices:
+                chunks = flat[start:end]
+
+                try:
+                    _save_embed_cache(_embed_cache_path(doc), chunks, embeddings[start:end])
+                except Exception as e:
+                    # Caching is best-effort; never fail indexing over it
+                    logger.warning("⚠️  Could not cache embeddings for %s: %s", doc['name'], str(e))
+
+                _add_to_store(doc, chunks, embeddings[start:end])
                 total_chunks += len(chunks)
                 processed_docs += 1
-                print(f"  ✅ Added {len(chunks)} chunks to index")
-            
-            except Exception as e:
+
+            # Release the wave's buffers before the next one
+            del flat, embeddings
+            wave.clear()
+            wave_chunks = 0
+            gc.collect()
+
+        for doc, (chunks, embeddings, error) in zip(docs, results):
+            if error is not None:
                 failed_docs.append({
                     "name": doc['name'],
-                    "error": str(e)
+                    "error": error
                 })
-                print(f"  ❌ Error processing {doc['name']}: {str(e)}")
                 continue
+
+            # Cached documents stream straight into the index
+            if embeddings is not None:
+                _add_to_store(doc, chunks, embeddings)
+                total_chunks += len(chunks)
+                processed_docs += 1
+                continue
+
+            wave.append((doc, chunks))
+            wave_chunks += len(chunks)
+            if wave_chunks >= settings.index_stream_chunks:
+                await _flush_wave()
+
+        await _flush_wave()
         
         if total_chunks == 0:
             error_detail = {
@@ -283,8 +589,13 @@ async def index_all_documents():
             }
             raise HTTPException(status_code=400, detail=error_detail)
         
-        # Save the unified vector store
-        vector_store.save(settings.vector_store_path, "all_docs")
+        # Save to disk, then swap the freshly built store into the shared
+        # instance atomically - /chat never re-reads what we just wrote
+        new_store.save(settings.vector_store_path, "all_docs")
+        _save_manifest(indexed_manifest)
+        async with _store_lock:
+            await search_batcher.run(vector_store.adopt, new_store)
+            _bump_index_generation()
         
         response_detail = {
             "message": f"Successfully indexed documents from folder",
@@ -333,37 +644,58 @@ async def index_single_document(request: IndexRequest):
         
         document_id = request.document_id
         
-        # Read document
-        print(f"Reading document: {document_id}")
-        text = drive_service.get_document_content(document_id)
-        metadata = drive_service.get_document_metadata(document_id)
+        # Content and metadata are independent round trips - fetch them
+        # concurrently, off the event loop
+        logger.info("Reading document: %s", document_id)
+        text, metadata = await asyncio.gather(
+            drive_service.get_document_content_async(document_id),
+            asyncio.to_thread(drive_service.get_document_metadata, document_id)
+        )
         
         if not text or len(text.strip()) == 0:
             raise HTTPException(status_code=400, detail="Document is empty")
         
-        # Chunk text
-        chunks = chunker.chunk_text(text)
-        
+        # Chunk and embed off the event loop - both are CPU-bound and
+        # would otherwise stall every concurrent /chat for the duration
+        chunks = await asyncio.to_thread(chunker.chunk_text, text)
+
         if not chunks:
             raise HTTPException(status_code=400, detail="No valid chunks created")
+
+        logger.info("Created %d chunks", len(chunks))
+
+        embeddings = await asyncio.to_thread(
+            embedding_engine.encode, chunks, settings.embed_batch_size
+        )
         
-        print(f"Created {len(chunks)} chunks")
-        
-        # Generate embeddings
-        embeddings = embedding_engine.encode(chunks)
-        
-        # Load existing vector store or create new
-        vector_store = VectorStore(dimension=embedding_engine.dimension)
-        vector_store.load(settings.vector_store_path, "all_docs")
-        
-        # Add to vector store
+        # Append to the delta sidecar - O(doc) instead of rewriting the
+        # full index and data file for every single-document add
         doc_metadata = {
             'doc_id': metadata['id'],
             'doc_name': metadata['name'],
             'modified': metadata['modified']
         }
-        vector_store.add_documents(chunks, embeddings, doc_metadata)
-        vector_store.save(settings.vector_store_path, "all_docs")
+        async with _store_lock:
+            # Reuse the shared vector store (re-read only if changed on
+            # disk); mutations run on the search thread so they can't
+            # race an in-flight batched search
+            await search_batcher.run(
+                vector_store.reload_if_changed, settings.vector_store_path, "all_docs"
+            )
+            await search_batcher.run(
+                vector_store.append_documents,
+                chunks, embeddings, doc_metadata, settings.vector_store_path, "all_docs"
+            )
+            # Merge the sidecar into the main index once it gets big
+            # enough that every search pays for the second scan
+            if await search_batcher.run(
+                vector_store.maybe_compact, settings.vector_store_path, "all_docs"
+            ):
+                logger.info("Compacted delta sidecar into main index")
+            manifest = _load_manifest()
+            manifest[metadata['id']] = metadata['modified']
+            _save_manifest(manifest)
+            _bump_index_generation()
         
         return IndexResponse(
             message=f"Successfully indexed document: {metadata['name']}",
@@ -377,6 +709,77 @@ async def index_single_document(request: IndexRequest):
         raise HTTPException(status_code=500, detail=f"Error indexing document: {str(e)}")
 
 
+async def _embed_and_search(query: str):
+    """Embed a query and search, with an exact-match LRU per index state"""
+    cache_key = (query, settings.top_k_results, _index_generation)
+    if cache_key in _search_cache:
+        _search_cache.move_to_end(cache_key)
+        return _search_cache[cache_key]
+
+    embedding = await asyncio.to_thread(embedding_engine.encode_single, query)
+    hits = await search_batcher.search(embedding, k=settings.top_k_results)
+
+    _search_cache[cache_key] = hits
+    while len(_search_cache) > _SEARCH_CACHE_MAX:
+        _search_cache.popitem(last=False)
+    return hits
+
+
+async def _resolve_and_search(question: str, conversation_history: list):
+    """Shared pre-answer pipeline for the chat endpoints
+
+    Speculatively embeds + searches the raw question while the clarity
+    check and (for follow-ups) the rephrase run concurrently - none of
+    the three depend on each other, so the Groq round trips overlap.
+    Returns (results, rephrased_query, clarification); clarification is
+    non-None when the question was too vague to answer.
+    """
+    speculative_search = asyncio.create_task(_embed_and_search(question))
+    rephrase_task = None
+
+    try:
+        clarity_task = asyncio.create_task(
+            llm_service.check_query_clarity(question, conversation_history)
+        )
+        if conversation_history and len(conversation_history) > 0:
+            rephrase_task = asyncio.create_task(
+                llm_service.rephrase_query(question, conversation_history)
+            )
+
+        is_clear, clarification = await clarity_task
+
+        if not is_clear and clarification:
+            speculative_search.cancel()
+            if rephrase_task is not None:
+                rephrase_task.cancel()
+            return None, None, clarification
+
+        rephrased_query = None
+        search_query = question
+
+        if rephrase_task is not None:
+            rephrased = await rephrase_task
+            if rephrased and rephrased.lower() != question.lower():
+                rephrased_query = rephrased
+                search_query = rephrased
+                logger.info("Original: %s", question)
+                logger.info("Rephrased: %s", rephrased)
+    except BaseException:
+        speculative_search.cancel()
+        if rephrase_task is not None:
+            rephrase_task.cancel()
+        raise
+
+    # Reuse the speculative search unless the query was rephrased
+    if search_query == question:
+        results = await speculative_search
+    else:
+        speculative_search.cancel()
+        results = await _embed_and_search(search_query)
+
+    return results, rephrased_query, None
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -390,46 +793,42 @@ async def chat(request: ChatRequest):
     """
     try:
         question = request.question
-        conversation_history = [msg.dict() for msg in request.conversation_history]
-        
-        # Step 1: Check if query needs clarification (ONLY if no conversation history)
-        is_clear, clarification = llm_service.check_query_clarity(question, conversation_history)
+        # One pydantic-v2 conversion, reused by clarity, rephrase and
+        # answer generation (msg.dict() is a deprecated copying alias)
+        conversation_history = [msg.model_dump() for msg in request.conversation_history]
         
-        if not is_clear and clarification:
+        # Step 1: Make sure the long-lived vector store is current
+        if not await _ensure_store_current():
+            raise HTTPException(
+                status_code=404,
+                detail="No documents indexed. Please use /index-all to index your folder first."
+            )
+
+        # Semantic cache: a first-turn question close enough (cosine) to a
+        # previously answered one returns that answer outright. Follow-ups
+        # are excluded - their answers depend on conversation history.
+        question_embedding = None
+        if not conversation_history:
+            question_embedding = await asyncio.to_thread(
+                embedding_engine.encode_single, question
+            )
+            cached_response = semantic_cache.get(question_embedding)
+            if cached_response is not None:
+                logger.info("Semantic cache hit for: %s", question)
+                return cached_response
+
+        results, rephrased_query, clarification = await _resolve_and_search(
+            question, conversation_history
+        )
+
+        if clarification is not None:
             return ChatResponse(
                 answer=clarification,
                 sources=[],
                 is_clarification=True,
                 rephrased_query=None
             )
-        
-        # Step 2: Rephrase query if there's conversation history
-        rephrased_query = None
-        search_query = question
-        
-        if conversation_history and len(conversation_history) > 0:
-            rephrased = llm_service.rephrase_query(question, conversation_history)
-            if rephrased and rephrased.lower() != question.lower():
-                rephrased_query = rephrased
-                search_query = rephrased
-                print(f"Original: {question}")
-                print(f"Rephrased: {rephrased}")
-        
-        # Step 3: Load the unified vector store
-        vector_store = VectorStore(dimension=embedding_engine.dimension)
-        
-        if not vector_store.load(settings.vector_store_path, "all_docs"):
-            raise HTTPException(
-                status_code=404,
-                detail="No documents indexed. Please use /index-all to index your folder first."
-            )
-        
-        # Step 4: Generate query embedding (use rephrased query if available)
-        query_embedding = embedding_engine.encode_single(search_query)
-        
-        # Step 5: Retrieve relevant chunks
-        results = vector_store.search(query_embedding, k=settings.top_k_results)
-        
+
         if not results:
             return ChatResponse(
                 answer="I couldn't find any relevant information in the indexed documents to answer your question. Could you please rephrase or ask about something else?",
@@ -448,85 +847,84 @@ async def chat(request: ChatRequest):
             sources.append(f"📄 {doc_name}: {chunk[:100]}...")
         
         # Step 7: Generate answer with conversation history
-        answer = llm_service.generate_answer(
+        answer = await llm_service.generate_answer(
             relevant_chunks, 
             question,  # Use original question for answer generation
             conversation_history
         )
         
-        return ChatResponse(
+        response = ChatResponse(
             answer=answer,
             sources=sources,
             is_clarification=False,
             rephrased_query=rephrased_query
         )
-    
+
+        if question_embedding is not None:
+            semantic_cache.put(question_embedding, response)
+
+        return response
+
     except HTTPException:
         raise
     except Exception as e:
-        # Better error handling with rate limit detection
-        error_msg = str(e)
-        
-        # Check for rate limit errors (GROQ API)
-        if "rate_limit" in error_msg.lower() or "429" in error_msg or "too many requests" in error_msg.lower():
+        # Rate limit / auth / model failures map through the precompiled
+        # classifier; anything unrecognized becomes a 500
+        raise _classify_chat_error(str(e))
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat
+
+    Same retrieval pipeline, but the answer is sent token-by-token as
+    plain text while the model generates it, so the first words reach
+    the client in tens of milliseconds instead of after the full
+    completion. Clarifications and no-result fallbacks stream as their
+    full text.
+    """
+    try:
+        question = request.question
+        conversation_history = [msg.model_dump() for msg in request.conversation_history]
+
+        if not await _ensure_store_current():
             raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": "Rate Limit Exceeded",
-                    "message": "Too many requests to the AI service. Please wait a moment.",
-                    "retry_after": "30 seconds",
-                    "steps": [
-                        "1. Wait 30 seconds before trying again",
-                        "2. Reduce the frequency of your requests",
-                        "3. Consider upgrading your GROQ API plan for higher limits"
-                    ]
-                }
+                status_code=404,
+                detail="No documents indexed. Please use /index-all to index your folder first."
             )
-        
-        # Check for API authentication errors
-        if "api" in error_msg.lower() or "authentication" in error_msg.lower() or "401" in error_msg:
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "error": "AI Service Unavailable",
-                    "message": "Cannot connect to AI service. Please check your API key.",
-                    "steps": [
-                        "1. Verify GROQ_API_KEY in your .env file",
-                        "2. Ensure the API key is valid and active",
-                        "3. Check if your GROQ account has credits",
-                        "4. Try regenerating your API key at console.groq.com"
-                    ]
-                }
+
+        results, _, clarification = await _resolve_and_search(
+            question, conversation_history
+        )
+
+        if clarification is not None:
+            return StreamingResponse(
+                iter([clarification]), media_type="text/plain; charset=utf-8"
             )
-        
-        # Check for embedding/model errors
-        if "model" in error_msg.lower() or "embedding" in error_msg.lower():
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "error": "Model Service Error",
-                    "message": "Error generating embeddings or processing text.",
-                    "steps": [
-                        "1. The embedding service may be temporarily down",
-                        "2. Try again in a few moments",
-                        "3. Check your internet connection"
-                    ]
-                }
+
+        if not results:
+            return StreamingResponse(
+                iter(["I couldn't find any relevant information in the indexed "
+                      "documents to answer your question. Could you please "
+                      "rephrase or ask about something else?"]),
+                media_type="text/plain; charset=utf-8"
             )
-        
-        raise HTTPException(
-            status_code=500, 
-            detail={
-                "error": "Chat Processing Error",
-                "message": error_msg,
-                "steps": [
-                    "1. Try asking your question differently",
-                    "2. If problem persists, check server logs",
-                    "3. Verify all services are running properly"
-                ]
-            }
+
+        relevant_chunks = [chunk for chunk, distance, metadata in results]
+
+        return StreamingResponse(
+            llm_service.generate_answer_stream(
+                relevant_chunks, question, conversation_history
+            ),
+            media_type="text/plain; charset=utf-8"
         )
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _classify_chat_error(str(e))
+
 
 @app.post("/reindex")
 async def reindex_all():
@@ -539,10 +937,17 @@ async def reindex_all():
     - You want to refresh the index
     """
     try:
-        # Clear existing index
-        vector_store = VectorStore(dimension=embedding_engine.dimension)
-        vector_store.clear()
-        
+        # Clear the in-memory index
+        async with _store_lock:
+            await search_batcher.run(vector_store.clear)
+
+        # Drop the manifest so the fast path can't declare the index up
+        # to date - this endpoint's whole purpose is to force a rebuild
+        try:
+            os.remove(_manifest_path())
+        except FileNotFoundError:
+            pass
+
         # Re-index everything
         return await index_all_documents()
     
@@ -554,19 +959,29 @@ async def reindex_all():
 async def clear_index():
     """Delete all indexed data"""
     try:
-        index_path = os.path.join(settings.vector_store_path, "all_docs_index.faiss")
-        data_path = os.path.join(settings.vector_store_path, "all_docs_data.pkl")
+        store_files = [
+            "all_docs_index.faiss",
+            "all_docs_data.json",
+            "all_docs_data.pkl",
+            "all_docs_chunks_offsets.npy",
+            "all_docs_chunks.npy",
+            "all_docs_chunk_doc_idx.npy",
+            "all_docs_delta.faiss",
+            "all_docs_delta_data.jsonl",
+            "all_docs_manifest.json",
+        ]
         
         deleted = False
-        if os.path.exists(index_path):
-            os.remove(index_path)
-            deleted = True
-        
-        if os.path.exists(data_path):
-            os.remove(data_path)
-            deleted = True
+        for stale in (os.path.join(settings.vector_store_path, name) for name in store_files):
+            if os.path.exists(stale):
+                os.remove(stale)
+                deleted = True
         
         if deleted:
+            # Drop the in-memory copy as well
+            async with _store_lock:
+                await search_batcher.run(vector_store.clear)
+                _bump_index_generation()
             return {"message": "Successfully cleared all indexed data"}
         else:
             raise HTTPException(status_code=404, detail="No index found")
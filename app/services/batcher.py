@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+class SearchBatcher:
+    """Micro-batches concurrent vector searches into one FAISS call
+
+    FAISS searches a (Q, d) query matrix in a single pass far more
+    cheaply than Q separate calls. Concurrent /chat requests enqueue
+    their query embedding here; pending queries are collected for up to
+    max_wait_ms (or until max_batch queue up), searched together, and
+    each caller gets its own top-k back via a future.
+    """
+
+    def __init__(self, vector_store, max_wait_ms: float = 5.0, max_batch: int = 32):
+        self.vector_store = vector_store
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending = []  # (query_embedding, k, future)
+        self._flush_task = None
+        self._lock = asyncio.Lock()
+        # Dedicated single worker for the blocking FAISS call: the event
+        # loop stays responsive during the search, and one calling thread
+        # means FAISS's own OpenMP pool never competes with a second
+        # concurrent search for the same cores
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="faiss-search")
+
+    async def run(self, fn, *args):
+        """Run a blocking store operation on the search worker thread
+
+        FAISS indexes are not safe to mutate (add/train/reload) while a
+        concurrent search runs on the same object. Every mutation of the
+        shared store is funneled through the same single-thread executor
+        that performs searches, so mutations and in-flight search_batch
+        calls serialize without the search path taking a lock.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, fn, *args
+        )
+
+    async def search(self, query_embedding: np.ndarray, k: int = 3):
+        """Enqueue one query and wait for its top-k results"""
+        future = asyncio.get_running_loop().create_future()
+
+        async with self._lock:
+            self._pending.append((query_embedding, k, future))
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+
+    async def _flush_after_wait(self):
+        await asyncio.sleep(self.max_wait)
+        async with self._lock:
+            self._flush_task = None
+            self._flush()
+
+    def _flush(self):
+        """Hand everything pending to the search worker (lock held)"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            queries = np.stack([query for query, _, _ in pending])
+            k_max = max(k for _, k, _ in pending)
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        search = asyncio.get_running_loop().run_in_executor(
+            self._executor, self.vector_store.search_batch, queries, k_max
+        )
+        search.add_done_callback(lambda done: self._deliver(done, pending))
+
+    @staticmethod
+    def _deliver(search, pending):
+        """Fan the batched results back out to the waiting futures"""
+        exc = search.exception()
+        if exc is not None:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, k, future), results in zip(pending, search.result()):
+            if not future.done():
+                future.set_result(results[:k])
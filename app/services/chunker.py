@@ -1,21 +1,152 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from typing import List
 
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Rust-backed chunker, optional: an order of magnitude faster than the
+# pure-Python splitter on large folders, with constant memory
+try:
+    from krira_augment import Pipeline, PipelineConfig
+    HAS_KRIRA = True
+except ImportError:
+    HAS_KRIRA = False
+
+
+def _find_chunk_boundaries(data: np.ndarray, chunk_size: int, chunk_overlap: int) -> np.ndarray:
+    """Compute (start, end) chunk offsets over a UTF-8 byte buffer
+
+    Sliding window that scans backwards from each window end for the best
+    separator (paragraph break > newline > sentence end > space), mirroring
+    the splitter's separator priority. Written in a numba-compilable subset
+    of Python: integer offsets over a uint8 array, no string objects, so it
+    JIT-compiles to native code when numba is installed.
+    """
+    n = data.shape[0]
+    min_step = max(1, (chunk_size - chunk_overlap) // 2)
+    bounds = np.empty((n // min_step + 2, 2), dtype=np.int64)
+    count = 0
+
+    start = 0
+    while start < n:
+        end = start + chunk_size
+        if end >= n:
+            bounds[count, 0] = start
+            bounds[count, 1] = n
+            count += 1
+            break
+
+        # Best separator wins; fall back to a hard cut at chunk_size
+        cut = -1
+        i = end
+        while i > start + 1:  # "\n\n"
+            if data[i - 1] == 10 and data[i - 2] == 10:
+                cut = i
+                break
+            i -= 1
+        if cut == -1:
+            i = end
+            while i > start:  # "\n"
+                if data[i - 1] == 10:
+                    cut = i
+                    break
+                i -= 1
+        if cut == -1:
+            i = end
+            while i > start + 1:  # ". "
+                if data[i - 2] == 46 and data[i - 1] == 32:
+                    cut = i
+                    break
+                i -= 1
+        if cut == -1:
+            i = end
+            while i > start:  # " "
+                if data[i - 1] == 32:
+                    cut = i
+                    break
+                i -= 1
+        if cut == -1:
+            cut = end
+
+        bounds[count, 0] = start
+        bounds[count, 1] = cut
+        count += 1
+
+        # Overlap into the next window, but always make forward progress
+        next_start = cut - chunk_overlap
+        if next_start < start + min_step:
+            next_start = start + min_step
+        start = next_start
+
+    return bounds[:count]
+
+
+if HAS_NUMBA:
+    _find_chunk_boundaries = njit(cache=True)(_find_chunk_boundaries)
+
+
 class TextChunker:
     def __init__(self, chunk_size: int = 800, chunk_overlap: int = 150):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._krira = None
+        if HAS_KRIRA:
+            self._krira = Pipeline(
+                PipelineConfig(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            )
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             separators=["\n\n", "\n", ". ", " ", ""],
             length_function=len
         )
-    
+
     def chunk_text(self, text: str) -> List[str]:
         """Split text into semantic chunks"""
-        if not text or len(text.strip()) == 0:
+        # isspace() avoids allocating a stripped copy of the whole doc
+        if not text or text.isspace():
             return []
-        
-        chunks = self.splitter.split_text(text)
-        # Filter out very small chunks
-        chunks = [chunk for chunk in chunks if len(chunk.strip()) > 50]
-        return chunks
\ No newline at end of file
+
+        # Fastest available backend wins: Rust pipeline, then the
+        # numba-compiled boundary search, then the pure-Python
+        # langchain splitter
+        if self._krira is not None:
+            return self._chunk_text_krira(text)
+        if HAS_NUMBA:
+            return self._chunk_text_fast(text)
+
+        # Filter out very small chunks; strip once per chunk
+        out = []
+        for chunk in self.splitter.split_text(text):
+            stripped = chunk.strip()
+            if len(stripped) > 50:
+                out.append(chunk)
+        return out
+
+    def _chunk_text_krira(self, text: str) -> List[str]:
+        """Chunk via the Rust pipeline, keeping the same size contract"""
+        out = []
+        for chunk in self._krira.process_text(text):
+            stripped = chunk.strip()
+            if len(stripped) > 50:
+                out.append(chunk)
+        return out
+
+    def _chunk_text_fast(self, text: str) -> List[str]:
+        """Chunk via the compiled offset kernel, slicing text in Python"""
+        raw = text.encode('utf-8')
+        data = np.frombuffer(raw, dtype=np.uint8)
+        bounds = _find_chunk_boundaries(data, self.chunk_size, self.chunk_overlap)
+
+        chunks = []
+        for start, end in bounds:
+            chunk = raw[start:end].decode('utf-8', errors='ignore')
+            stripped = chunk.strip()
+            if len(stripped) > 50:
+                chunks.append(chunk)
+        return chunks
@@ -0,0 +1,60 @@
+import hashlib
+import sqlite3
+import threading
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Persistent chunk-level embedding cache
+
+    Maps SHA-256(model_name | text) to the float32 vector, backed by a
+    single-table SQLite file. Re-indexing a folder where most content is
+    unchanged then only pays for the chunks that actually changed. The
+    model name is part of the key so switching encoders invalidates
+    cleanly instead of serving vectors from the wrong space.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(model_name: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model_name}|{text}".encode('utf-8')).digest()
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys present in the cache"""
+        found = {}
+        with self._lock:
+            # SQLite caps bound parameters per statement; page through
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).copy()
+        return found
+
+    def put_many(self, items):
+        """Store an iterable of (key, vector) pairs"""
+        rows = [
+            (key, np.asarray(vec, dtype=np.float32).tobytes())
+            for key, vec in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
@@ -3,12 +3,22 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from typing import Optional
 
+# Shared immutable defaults for .get() misses in the extraction walk
+_EMPTY = ()
+_EMPTY_DICT = {}
+
+
 class GoogleDocsReader:
-    def __init__(self, credentials_path: str):
-        self.credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=['https://www.googleapis.com/auth/documents.readonly']
-        )
+    def __init__(self, credentials_path: Optional[str] = None, credentials=None):
+        # Accept shared credentials so callers owning a Drive client reuse
+        # one identity (and one token refresh chain) instead of parsing
+        # the service-account file and refreshing tokens twice
+        if credentials is None:
+            credentials = service_account.Credentials.from_service_account_file(
+                credentials_path,
+                scopes=['https://www.googleapis.com/auth/documents.readonly']
+            )
+        self.credentials = credentials
         self.service = build('docs', 'v1', credentials=self.credentials)
     
     def read_document(self, document_id: str) -> str:
@@ -34,26 +44,35 @@ class GoogleDocsReader:
     
     def _extract_text(self, document: dict) -> str:
         """Extract plain text from document structure"""
-        text_parts = []
-        
-        content = document.get('body', {}).get('content', [])
-        
-        for element in content:
-            if 'paragraph' in element:
-                paragraph = element['paragraph']
-                for text_element in paragraph.get('elements', []):
-                    if 'textRun' in text_element:
-                        text_parts.append(text_element['textRun']['content'])
-            
-            elif 'table' in element:
-                table = element['table']
-                for row in table.get('tableRows', []):
-                    for cell in row.get('tableCells', []):
-                        for cell_content in cell.get('content', []):
-                            if 'paragraph' in cell_content:
-                                paragraph = cell_content['paragraph']
-                                for text_element in paragraph.get('elements', []):
-                                    if 'textRun' in text_element:
-                                        text_parts.append(text_element['textRun']['content'])
-        
-        return ''.join(text_parts).strip()
\ No newline at end of file
+        return ''.join(self._iter_runs(document)).strip()
+
+    @staticmethod
+    def _iter_paragraph_runs(paragraph: dict):
+        """Yield the text of each textRun in a paragraph"""
+        # _EMPTY defaults avoid allocating a fresh [] per .get() miss
+        for text_element in paragraph.get('elements', _EMPTY):
+            text_run = text_element.get('textRun')
+            if text_run is not None:
+                yield text_run['content']
+
+    def _iter_runs(self, document: dict):
+        """Stream text fragments straight into join - no intermediate list
+
+        Large docs produce thousands of small runs; yielding them keeps
+        peak allocation at one fragment instead of a parts list that the
+        join then walks a second time.
+        """
+        for element in document.get('body', _EMPTY_DICT).get('content', _EMPTY):
+            paragraph = element.get('paragraph')
+            if paragraph is not None:
+                yield from self._iter_paragraph_runs(paragraph)
+                continue
+
+            table = element.get('table')
+            if table is not None:
+                for row in table.get('tableRows', _EMPTY):
+                    for cell in row.get('tableCells', _EMPTY):
+                        for cell_content in cell.get('content', _EMPTY):
+                            paragraph = cell_content.get('paragraph')
+                            if paragraph is not None:
+                                yield from self._iter_paragraph_runs(paragraph)
\ No newline at end of file
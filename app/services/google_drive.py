@@ -1,9 +1,31 @@
 from google.oauth2 import service_account
+from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from typing import List, Dict
+import asyncio
+
+import httpx
+
 from app.services.google_docs import GoogleDocsReader
 
+DOCS_API_URL = "https://docs.googleapis.com/v1/documents/{document_id}"
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Everything listings ever need in one mask - no follow-up files().get
+LIST_FIELDS = "files(id,name,modifiedTime,createdTime,webViewLink),nextPageToken"
+
+
+def _file_entry(file: Dict) -> Dict[str, str]:
+    """Normalize a Drive file resource into the listing dict shape"""
+    return {
+        'id': file['id'],
+        'name': file['name'],
+        'modified': file.get('modifiedTime', 'Unknown'),
+        'created': file.get('createdTime', 'Unknown'),
+        'url': file.get('webViewLink', '')
+    }
+
 class GoogleDriveService:
     def __init__(self, credentials_path: str):
         self.credentials = service_account.Credentials.from_service_account_file(
@@ -14,29 +36,127 @@ class GoogleDriveService:
             ]
         )
         self.drive_service = build('drive', 'v3', credentials=self.credentials)
-        self.docs_reader = GoogleDocsReader(credentials_path)
+        # Docs reader shares our credentials: one service-account parse,
+        # one access token refreshed for both APIs
+        self.docs_reader = GoogleDocsReader(credentials=self.credentials)
+        self._async_client = None
+
+    def _access_token(self) -> str:
+        """Return a valid OAuth access token, refreshing if expired (blocking)"""
+        if not self.credentials.valid:
+            self.credentials.refresh(Request())
+        return self.credentials.token
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared async HTTP client (pooled connections)"""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(timeout=30.0)
+        return self._async_client
+
+    async def get_document_content_async(self, document_id: str) -> str:
+        """Async version of get_document_content
+
+        Fetches the document JSON straight from the Docs REST API over a
+        shared httpx client, so concurrent fetches overlap on the event
+        loop instead of serializing behind the blocking discovery client.
+        """
+        token = await asyncio.to_thread(self._access_token)
+
+        response = await self._get_async_client().get(
+            DOCS_API_URL.format(document_id=document_id),
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 404:
+            raise Exception(f"Document not found. Please check the document ID: {document_id}")
+        elif response.status_code == 403:
+            raise Exception(
+                f"Permission denied. Please ensure:\n"
+                f"1. The document is shared with your service account\n"
+                f"2. The service account has at least 'Viewer' access\n"
+                f"3. The document is not private/restricted"
+            )
+        response.raise_for_status()
+
+        return self.docs_reader._extract_text(response.json())
     
+    async def list_documents_in_folder_async(self, folder_id: str) -> List[Dict[str, str]]:
+        """Async version of list_documents_in_folder
+
+        Same Drive files.list query over the shared httpx client, so
+        request handlers don't block the event loop on a folder listing.
+        """
+        token = await asyncio.to_thread(self._access_token)
+        query = (
+            f"'{folder_id}' in parents and "
+            f"mimeType='application/vnd.google-apps.document' and trashed=false"
+        )
+
+        files = []
+        page_token = None
+        while True:
+            params = {
+                "q": query,
+                "fields": LIST_FIELDS,
+                "orderBy": "modifiedTime desc",
+                # Drive's max page size: 10x fewer round trips than the
+                # default 100 on large folders
+                "pageSize": 1000
+            }
+            if page_token:
+                params["pageToken"] = page_token
+
+            response = await self._get_async_client().get(
+                DRIVE_FILES_URL,
+                params=params,
+                headers={"Authorization": f"Bearer {token}"}
+            )
+
+            if response.status_code == 404:
+                raise Exception(
+                    f"Folder not found. Please check:\n"
+                    f"1. The folder ID is correct\n"
+                    f"2. The folder exists in Google Drive"
+                )
+            elif response.status_code == 403:
+                raise Exception(
+                    f"Permission denied. Please ensure:\n"
+                    f"1. The folder is shared with your service account\n"
+                    f"2. Service account email has at least 'Viewer' access\n"
+                    f"3. Check your GOOGLE_DRIVE_FOLDER_ID in .env"
+                )
+            response.raise_for_status()
+
+            payload = response.json()
+            files.extend(payload.get('files', []))
+            page_token = payload.get('nextPageToken')
+            if not page_token:
+                break
+
+        return [_file_entry(file) for file in files]
+
     def list_documents_in_folder(self, folder_id: str) -> List[Dict[str, str]]:
         """List all Google Docs in a folder"""
         try:
             query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.document' and trashed=false"
-            
-            results = self.drive_service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime)",
-                orderBy="modifiedTime desc"
-            ).execute()
-            
-            files = results.get('files', [])
-            
-            return [
-                {
-                    'id': file['id'],
-                    'name': file['name'],
-                    'modified': file.get('modifiedTime', 'Unknown')
-                }
-                for file in files
-            ]
+
+            files = []
+            page_token = None
+            while True:
+                results = self.drive_service.files().list(
+                    q=query,
+                    fields=LIST_FIELDS,
+                    orderBy="modifiedTime desc",
+                    pageSize=1000,
+                    pageToken=page_token
+                ).execute()
+
+                files.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+
+            return [_file_entry(file) for file in files]
         
         except HttpError as e:
             if e.resp.status == 404:
@@ -1,22 +1,160 @@
-from groq import Groq
-from typing import List, Dict, Tuple, Optional
+from groq import AsyncGroq
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Tuple, Optional
+import hashlib
+import logging
+import re
+import time
+
+import orjson
+
+# Child of the "app" logger so records flow through its queue handler
+logger = logging.getLogger("app.llm")
+
+
+class _TTLCache:
+    """Small TTL + LRU cache for LLM pre-processing results"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Strips markdown code fences the model sometimes wraps JSON in
+_FENCE_RE = re.compile(r'^```(?:json)?|```$', re.M)
+
+# Filler words the clarity model always flags as vague; questions made
+# entirely of these are decided locally instead of with a Groq round trip
+_VAGUE_WORDS = frozenset({
+    'what', 'huh', 'more', 'why', 'how', 'ok', 'okay', 'eh', 'hmm',
+    'so', 'and', 'tell', 'me', 'it', 'that', 'this'
+})
+
+
+# ~4 chars per token is a good estimate for English prose on Llama-style
+# tokenizers; a ">> 2" keeps the check allocation-free
+_HISTORY_TOKEN_BUDGET = 50
+
+
+def _truncate_tokens(text: str, budget: int = _HISTORY_TOKEN_BUDGET) -> str:
+    """Trim text to ~budget tokens, cutting on a word boundary
+
+    A character slice like [:200] can split mid-word (or mid-codepoint
+    once encoded), wasting prompt tokens on a broken fragment; trimming
+    at whitespace keeps every included token meaningful.
+    """
+    if len(text) >> 2 <= budget:
+        return text
+    cut = text[:budget * 4]
+    head, sep, _ = cut.rpartition(' ')
+    return (head if sep else cut) + "..."
+
+
+def _history_key(question: str, conversation_history: List[Dict[str, str]]) -> bytes:
+    """Compact cache key over the history the prompts actually use
+
+    A 16-byte blake2b digest instead of a tuple of full message strings:
+    cache entries stop pinning whole conversations in memory, and key
+    comparison is a fixed-size memcmp rather than string-by-string.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for msg in (conversation_history or [])[-6:]:
+        h.update(msg['role'].encode('utf-8'))
+        h.update(b'\x00')
+        h.update(msg['content'].encode('utf-8'))
+        h.update(b'\x00')
+    h.update(question.encode('utf-8'))
+    return h.digest()
+
 
 class LLMService:
     def __init__(self, api_key: str):
-        """Initialize GROQ client"""
-        self.client = Groq(api_key=api_key)
+        """Initialize GROQ client
+
+        Async client: Groq round trips are pure I/O, so awaiting them on
+        the event loop lets clarity, rephrase and retrieval overlap
+        without burning threadpool workers per call.
+        """
+        self.client = AsyncGroq(api_key=api_key)
         self.model = "llama-3.3-70b-versatile"
+
+        # Repeated questions skip the clarity/rephrase round trips for an
+        # hour; answers themselves stay uncached (temperature-sampled)
+        self._clarity_cache = _TTLCache()
+        self._rephrase_cache = _TTLCache()
+
+        # Static prompt segments built once; generate_answer joins them
+        # with the per-request parts instead of re-rendering a large
+        # f-string template on every call
+        self._system_msg = (
+            "You are a document-based Q&A assistant. You understand "
+            "conversation context but only answer from provided documents. "
+            "You're helpful and direct."
+        )
+        self._answer_header = (
+            "You are a helpful AI assistant answering questions about documents.\n"
+            "\n"
+            "DOCUMENT CONTENT:\n"
+        )
+        self._answer_instructions = """
+
+CRITICAL INSTRUCTIONS:
+1. Answer ONLY using information from the DOCUMENT CONTENT above
+2. Use the conversation history to understand context for follow-up questions
+3. If the user refers to something from previous messages (like "it", "that", "the technique"), use the conversation to understand what they mean, but ANSWER from the documents
+4. Include inline citations: "According to the document..." or "As mentioned in the guide..."
+5. If documents don't contain the answer, say: "I don't have enough information in the provided documents to answer that question."
+6. Be direct and helpful - don't ask for clarification unless absolutely necessary
+7. Keep answers clear and concise
+
+ANSWER:"""
     
-    def check_query_clarity(self, question: str, conversation_history: List[Dict[str, str]] = None) -> Tuple[bool, Optional[str]]:
+    async def check_query_clarity(self, question: str, conversation_history: List[Dict[str, str]] = None) -> Tuple[bool, Optional[str]]:
         """Check if query is clear or needs clarification"""
         
         # If there's conversation history, the query is likely clear in context
         if conversation_history and len(conversation_history) > 0:
             return True, None
-        
+
+        # Questions with a few words are clear enough - not worth an LLM
+        # round trip on the hot path
+        if len(question.split()) >= 4:
+            return True, None
+
+        # Pure filler ("what?", "more", "huh") is vague by inspection -
+        # no need to ask the model what it would say every time
+        words = question.strip().lower().rstrip('?.!').split()
+        if not words or set(words) <= _VAGUE_WORDS:
+            return False, (
+                "Could you give me a bit more detail about what you'd "
+                "like to know?"
+            )
+
         # Only check clarity for first question or when no context
         # Very short questions (< 10 chars) might need clarification
         if len(question.strip()) < 10:
+            cached = self._clarity_cache.get(question)
+            if cached is not None:
+                return cached
+
             prompt = f"""Is this question too vague to answer without more context?
 
 Question: "{question}"
@@ -30,38 +168,44 @@ Respond with ONLY a JSON object:
 Mark as clear (true) unless the question is extremely vague like "what?", "huh?", "more", etc."""
 
             try:
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.1,
                     max_tokens=150
                 )
                 
-                import json
                 result_text = response.choices[0].message.content.strip()
-                result_text = result_text.replace('```json', '').replace('```', '').strip()
-                result = json.loads(result_text)
-                
+                result = orjson.loads(_FENCE_RE.sub('', result_text).strip())
+
+                verdict = (True, None)
                 if not result.get("is_clear", True):
-                    return False, result.get("suggested_clarification")
+                    verdict = (False, result.get("suggested_clarification"))
+                self._clarity_cache.put(question, verdict)
+                return verdict
             except:
                 pass
         
         # Default: assume query is clear
         return True, None
     
-    def rephrase_query(self, question: str, conversation_history: List[Dict[str, str]]) -> str:
+    async def rephrase_query(self, question: str, conversation_history: List[Dict[str, str]]) -> str:
         """Rephrase query based on conversation context"""
         
         if not conversation_history or len(conversation_history) == 0:
             return question
-        
+
+        cache_key = _history_key(question, conversation_history)
+        cached = self._rephrase_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Build conversation context - include more history for better understanding
         context_parts = []
         for msg in conversation_history[-6:]:  # Last 6 messages (3 exchanges)
             role = "User" if msg['role'] == 'user' else "Assistant"
             # Keep full user messages, truncate assistant messages
-            content = msg['content'] if msg['role'] == 'user' else msg['content'][:200]
+            content = msg['content'] if msg['role'] == 'user' else _truncate_tokens(msg['content'])
             context_parts.append(f"{role}: {content}")
         
         context = "\n".join(context_parts)
@@ -91,7 +235,7 @@ RULES:
 REPHRASED QUESTION:"""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
@@ -112,82 +256,104 @@ REPHRASED QUESTION:"""
             if rephrased and len(rephrased) > 0:
                 # Check if significantly different (not just punctuation changes)
                 if rephrased.lower().strip('?.,! ') != question.lower().strip('?.,! '):
+                    self._rephrase_cache.put(cache_key, rephrased)
                     return rephrased
-            
+
+            self._rephrase_cache.put(cache_key, question)
             return question
         
         except Exception as e:
-            print(f"Rephrasing error: {e}")
+            logger.warning("Rephrasing error: %s", e)
             return question
     
-    def generate_answer(
-        self, 
-        context_chunks: List[str], 
+    def _build_answer_messages(
+        self,
+        context_chunks: List[str],
         question: str,
         conversation_history: List[Dict[str, str]] = None
-    ) -> str:
-        """Generate answer using GROQ LLM with conversation history"""
-        
-        # Combine context chunks
-        context = "\n\n".join([f"[Document Section {i+1}]\n{chunk}" for i, chunk in enumerate(context_chunks)])
-        
-        # Build conversation history for prompt
-        history_text = ""
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for answer generation
+
+        Assembled as one join over prebuilt static segments and the
+        per-request parts - no template re-rendering, no quadratic +=
+        on the history text.
+        """
+        parts = [self._answer_header]
+        for i, chunk in enumerate(context_chunks):
+            parts.append(f"[Document Section {i+1}]\n{chunk}")
+            parts.append("\n\n")
+
         if conversation_history and len(conversation_history) > 0:
             # Include last 6 messages (3 exchanges)
-            recent_history = conversation_history[-6:]
-            history_text = "\n\nRECENT CONVERSATION:\n"
-            for msg in recent_history:
-                role = "User" if msg['role'] == 'user' else "Assistant"
-                # Keep user questions full, truncate assistant responses
+            parts.append("\nRECENT CONVERSATION:\n")
+            for msg in conversation_history[-6:]:
                 if msg['role'] == 'user':
-                    history_text += f"{role}: {msg['content']}\n"
+                    # Keep user questions full
+                    parts.append(f"User: {msg['content']}\n")
                 else:
-                    # Only show first 200 chars of previous answers
-                    content = msg['content'][:200] + "..." if len(msg['content']) > 200 else msg['content']
-                    history_text += f"{role}: {content}\n"
-            
-            history_text += "\n(Use this conversation context to understand follow-up questions)"
-        
-        # Create prompt
-        prompt = f"""You are a helpful AI assistant answering questions about documents.
+                    # Trim previous answers to a small token budget
+                    parts.append(f"Assistant: {_truncate_tokens(msg['content'])}\n")
+            parts.append("\n(Use this conversation context to understand follow-up questions)")
 
-DOCUMENT CONTENT:
-{context}
-{history_text}
+        parts.append(f"\n\nCURRENT USER QUESTION: {question}")
+        parts.append(self._answer_instructions)
 
-CURRENT USER QUESTION: {question}
-
-CRITICAL INSTRUCTIONS:
-1. Answer ONLY using information from the DOCUMENT CONTENT above
-2. Use the conversation history to understand context for follow-up questions
-3. If the user refers to something from previous messages (like "it", "that", "the technique"), use the conversation to understand what they mean, but ANSWER from the documents
-4. Include inline citations: "According to the document..." or "As mentioned in the guide..."
-5. If documents don't contain the answer, say: "I don't have enough information in the provided documents to answer that question."
-6. Be direct and helpful - don't ask for clarification unless absolutely necessary
-7. Keep answers clear and concise
-
-ANSWER:"""
+        return [
+            {"role": "system", "content": self._system_msg},
+            {"role": "user", "content": "".join(parts)}
+        ]
 
+    async def generate_answer(
+        self,
+        context_chunks: List[str],
+        question: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> str:
+        """Generate answer using GROQ LLM with conversation history"""
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a document-based Q&A assistant. You understand conversation context but only answer from provided documents. You're helpful and direct."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._build_answer_messages(
+                    context_chunks, question, conversation_history
+                ),
                 temperature=0.3,
                 max_tokens=600,
                 top_p=0.9
             )
-            
+
             return response.choices[0].message.content.strip()
-        
+
+        except Exception as e:
+            raise Exception(f"Error generating answer: {str(e)}")
+
+    async def generate_answer_stream(
+        self,
+        context_chunks: List[str],
+        question: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """Yield the answer token-by-token as the model produces it
+
+        Same prompt and sampling as generate_answer, but with stream=True
+        the first token arrives in tens of milliseconds instead of after
+        the full completion, so callers can start rendering immediately.
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_answer_messages(
+                    context_chunks, question, conversation_history
+                ),
+                temperature=0.3,
+                max_tokens=600,
+                top_p=0.9,
+                stream=True
+            )
+
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
         except Exception as e:
             raise Exception(f"Error generating answer: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import faiss
+import numpy as np
+
+
+class SemanticQueryCache:
+    """Near-duplicate question cache over query embeddings
+
+    Exact-match caches miss paraphrases ("what's the refund policy?" vs
+    "how do refunds work?"). This keeps a small flat inner-product index
+    of past query embeddings; a lookup whose cosine similarity to a
+    cached query clears the threshold returns that query's stored
+    response without retrieval or generation. Entries are evicted
+    oldest-first and the whole cache drops on index changes.
+    """
+
+    def __init__(self, dimension: int, threshold: float = 0.95,
+                 max_entries: int = 10000):
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._index = faiss.IndexFlatIP(dimension)
+        self._vectors = []   # unit vectors, parallel to _entries
+        self._entries = []
+
+    def _normalize(self, embedding: np.ndarray) -> np.ndarray:
+        query = np.ascontiguousarray(embedding, dtype='float32').reshape(1, -1)
+        faiss.normalize_L2(query)
+        return query
+
+    def get(self, embedding: np.ndarray):
+        """Return the stored value for a near-duplicate query, or None"""
+        if self._index.ntotal == 0:
+            return None
+
+        query = self._normalize(embedding)
+        distances, indices = self._index.search(query, 1)
+        best = indices[0][0]
+        if best >= 0 and distances[0][0] >= self.threshold:
+            return self._entries[best]
+        return None
+
+    def put(self, embedding: np.ndarray, value):
+        query = self._normalize(embedding)
+
+        if len(self._entries) >= self.max_entries:
+            # Drop the older half and rebuild the flat index once
+            keep = self.max_entries // 2
+            self._vectors = self._vectors[-keep:]
+            self._entries = self._entries[-keep:]
+            self._index.reset()
+            self._index.add(np.vstack(self._vectors))
+
+        self._vectors.append(query[0])
+        self._entries.append(value)
+        self._index.add(query)
+
+    def invalidate(self):
+        """Drop everything - answers are stale once the corpus changes"""
+        self._index.reset()
+        self._vectors = []
+        self._entries = []